@@ -3,7 +3,7 @@
 import os
 from datetime import datetime, timedelta
 from typing import Optional
-from config import settings
+from config import get_settings
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
@@ -17,6 +17,7 @@ from repositories.user_repository import UserRepository
 from schemas.auth import Token, TokenData, UserInDB # define these Pydantic schemas
 
 # Secret Key, Algorithm, and Token Expiration
+settings = get_settings()
 SECRET_KEY = settings.secret_key
 ALGORITHM = settings.algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
@@ -1,3 +1,5 @@
+from functools import cached_property, lru_cache
+
 from pydantic import Field, field_validator, ConfigDict
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -8,6 +10,11 @@ class Settings(BaseSettings):
     SUPABASE_KEY: str
     DATABASE_URL: str | None = None
 
+    # Database connection pool
+    db_pool_size: int = 20
+    db_max_overflow: int = 40
+    db_pool_recycle: int = 1800
+
     # JWT Authentication
     secret_key: str
     algorithm: str = "HS256"
@@ -16,6 +23,7 @@ class Settings(BaseSettings):
     # Application settings
     environment: str = "development"
     debug: bool = False
+    log_level: str = "INFO"
     frontend_url: str = "http://localhost:3000"
     upload_directory: str = "./uploads"
     allowed_origins_str: str = Field(
@@ -27,6 +35,9 @@ class Settings(BaseSettings):
     JOB_APPLY_API_BASE: str | None = None
     JOB_APPLY_API_KEY: str | None = None
     JOB_APPLY_ASSISTANT_ID: str | None = None
+    # cap on concurrent agent runs so traffic spikes queue here instead of
+    # fanning out into upstream rate limits
+    JOB_APPLY_MAX_CONCURRENT_RUNS: int = 32
 
     @field_validator("DATABASE_URL", mode="before")
     def db_url(cls, v, values):
@@ -34,10 +45,10 @@ class Settings(BaseSettings):
             return v
         return f"postgresql://postgres:{values.data.get('SUPABASE_KEY')}@{values.data.get('SUPABASE_URL')}"
 
-    @property
+    @cached_property
     def allowed_origins(self) -> list[str]:
-        """Parse allowed_origins as a comma-separated list"""
-        return [origin.strip() for origin in self.allowed_origins_str.split(",") if origin.strip()]
+        """Parse allowed_origins as a comma-separated list (computed once per instance)"""
+        return list(filter(None, map(str.strip, self.allowed_origins_str.split(","))))
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -47,4 +58,7 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()  # type: ignore[call-arg]
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build Settings once per process; env parsing and validation are cached"""
+    return Settings()  # type: ignore[call-arg]
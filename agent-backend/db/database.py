@@ -1,19 +1,65 @@
 # db/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from config import settings  # <— no dot
+from typing import AsyncIterator
 
-engine = create_engine(settings.DATABASE_URL)
+from sqlalchemy import Connection, URL, inspect, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+from config import get_settings  # <— no dot
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+settings = get_settings()
 
-Base = declarative_base()
 
+def _async_database_url(url: str) -> URL:
+    """Point a postgresql:// or postgresql+psycopg2:// URL at the asyncpg driver"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+        if "sslmode" in parsed.query:
+            # asyncpg takes libpq's sslmode values under the "ssl" keyword
+            query = dict(parsed.query)
+            query["ssl"] = query.pop("sslmode")
+            parsed = parsed.set(query=query)
+    return parsed
 
-def get_db():
-    from sqlalchemy.orm import Session
-    db: Session = SessionLocal()
-    try:
+
+# pre_ping drops dead connections before use; LIFO keeps a small set of
+# connections warm instead of cycling through the whole pool
+engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL or ""),
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
+)
+
+# expire_on_commit=False keeps loaded attributes usable after commit without
+# an extra SELECT to refresh them
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+def _create_missing_tables(conn: Connection) -> list[str]:
+    present = set(inspect(conn).get_table_names())
+    missing = [t for t in Base.metadata.sorted_tables if t.name not in present]
+    if missing:
+        Base.metadata.create_all(bind=conn, tables=missing, checkfirst=False)
+    return [t.name for t in missing]
+
+
+async def create_missing_tables() -> list[str]:
+    """
+    Create only the tables that don't exist yet.
+    A single get_table_names() reflection replaces the per-table existence
+    checks create_all() would otherwise run on every startup.
+    """
+    async with engine.begin() as conn:
+        return await conn.run_sync(_create_missing_tables)
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
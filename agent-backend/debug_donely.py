@@ -1,40 +1,54 @@
 """
 Debug script to find the Donely assistant ID from the API
 """
+import argparse
+import logging
+import os
+
 import httpx
 import asyncio
 
+DONELY_API_BASE = "https://job-apply-api.donely.ai"
+
+logger = logging.getLogger(__name__)
 
-async def get_assistants():
+
+async def get_assistants(client: httpx.AsyncClient):
     """Fetch available assistants from Donely API"""
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            # Try to get assistants list
-            resp = await client.get("https://job-apply-api.donely.ai/assistants")
-            print(f"Status: {resp.status_code}")
-            print(f"Response: {resp.text}")
-            return resp.json()
-        except Exception as e:
-            print(f"Error: {e}")
-            return None
-
-
-async def get_graphs():
+    try:
+        # Try to get assistants list
+        resp = await client.get("/assistants")
+        logger.info("GET /assistants -> %s %s", resp.status_code, resp.text)
+        return resp.json()
+    except Exception as e:
+        logger.error("GET /assistants failed: %s", e)
+        return None
+
+
+async def get_graphs(client: httpx.AsyncClient):
     """Fetch available graphs from Donely API"""
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            resp = await client.get("https://job-apply-api.donely.ai/graphs")
-            print(f"Status: {resp.status_code}")
-            print(f"Response: {resp.text}")
-            return resp.json()
-        except Exception as e:
-            print(f"Error: {e}")
-            return None
+    try:
+        resp = await client.get("/graphs")
+        logger.info("GET /graphs -> %s %s", resp.status_code, resp.text)
+        return resp.json()
+    except Exception as e:
+        logger.error("GET /graphs failed: %s", e)
+        return None
+
+
+async def main():
+    """Probe both endpoints concurrently over a single connection"""
+    async with httpx.AsyncClient(base_url=DONELY_API_BASE, http2=True, timeout=10.0) as client:
+        return await asyncio.gather(get_assistants(client), get_graphs(client))
 
 
 if __name__ == "__main__":
-    print("=== Trying to fetch assistants ===")
-    asyncio.run(get_assistants())
-    
-    print("\n=== Trying to fetch graphs ===")
-    asyncio.run(get_graphs())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quiet", action="store_true", help="only log warnings and errors")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else os.getenv("LOG_LEVEL", "INFO").upper(),
+        format="%(message)s",
+    )
+    asyncio.run(main())
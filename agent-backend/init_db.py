@@ -1,8 +1,16 @@
-from db.database import Base, engine
+import asyncio
+
+from db.database import create_missing_tables, engine
 import models.customer  # import every model module
 import models.conversation
 import models.document
 
-print("About to create tables on:", engine.url)
-Base.metadata.create_all(bind=engine)
-print("Done.")
+
+async def main():
+    print("About to create tables on:", engine.url)
+    created = await create_missing_tables()
+    print("Done. Created:", created or "none")
+    await engine.dispose()
+
+
+asyncio.run(main())
@@ -1,29 +1,92 @@
-from db.database import Base, engine
+import logging
+import queue
+from contextlib import asynccontextmanager, contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterator
+
+from db.database import Base, create_missing_tables, engine
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from config import settings
+from config import get_settings
 # Import model classes explicitly so SQLAlchemy registers them with Base
 from models.customer import Customer  # noqa: F401
 from models.conversation import Conversation  # noqa: F401
 from models.document import Document  # noqa: F401
 from routers import customers, conversations, chat, documents
+from services.job_apply_client import job_apply_client
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
 
-# Create tables only in development mode
-# Note: create_all() is idempotent - it only creates tables that don't exist
-# For production, use Alembic migrations instead
-if settings.environment == "development":
+
+@contextmanager
+def queued_logging(level: str) -> Iterator[None]:
+    """
+    Route log records through an in-memory queue so handlers running on the
+    event loop never block on a slow stdout pipe; a QueueListener thread does
+    the actual writes and is drained on exit.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    queue_handler = QueueHandler(log_queue)
+
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+    # httpx logs every request at INFO; keep only its warnings
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    listener.start()
     try:
-        print("Creating database tables (development mode)...")
-        Base.metadata.create_all(bind=engine)
-        print(f"Tables ready. Available tables: {list(Base.metadata.tables.keys())}")
-    except Exception as e:
-        print(f"Error creating tables: {e}")
-        raise
-else:
-    print("Skipping table creation (production mode - use migrations)")
+        yield
+    finally:
+        root.removeHandler(queue_handler)
+        listener.stop()
+
 
-app = FastAPI(title="JobProMax Internal API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with queued_logging(settings.log_level):
+        # Create tables only in development mode
+        # Note: only tables that don't exist yet are created
+        # For production, use Alembic migrations instead
+        if settings.environment == "development":
+            try:
+                logger.info("Creating database tables (development mode)...")
+                created = await create_missing_tables()
+                logger.info(
+                    "Tables ready. Created: %s; available tables: %s",
+                    created or "none",
+                    list(Base.metadata.tables.keys()),
+                )
+            except Exception:
+                logger.exception("Error creating tables")
+                raise
+        else:
+            logger.info("Skipping table creation (production mode - use migrations)")
+
+        await job_apply_client.warm_up()
+
+        yield
+
+        # Release pooled connections to the agent API and the database on shutdown
+        await job_apply_client.aclose()
+        await engine.dispose()
+
+
+app = FastAPI(
+    title="JobProMax Internal API",
+    version="0.1.0",
+    lifespan=lifespan,
+    # orjson encodes responses (including large raw agent payloads) much faster than stdlib json
+    default_response_class=ORJSONResponse,
+)
 
 origins = settings.allowed_origins or [settings.frontend_url]
 
@@ -33,6 +96,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # lets browser clients read the keyset cursor on paginated lists
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(customers.router)
@@ -1,24 +1,37 @@
 # backend/models/conversation.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
-from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import String, ForeignKey, DateTime, Index, desc, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from db.database import Base
 
+if TYPE_CHECKING:
+    from models.customer import Customer
+
 
 class Conversation(Base):
     __tablename__ = "conversations"
+    __table_args__ = (
+        # serves "conversations for a customer, newest first" as an index range
+        # scan with no sort step; also covers plain customer_id lookups
+        Index("ix_conversations_customer_created", "customer_id", desc("created_at")),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)
-    title = Column(String, nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    customer_id: Mapped[int | None] = mapped_column(ForeignKey("customers.id"))
+    title: Mapped[str] = mapped_column(String, nullable=False)
 
     # maps to thread/session id on the external job-apply service
-    external_thread_id = Column(String, nullable=False, unique=True)
+    external_thread_id: Mapped[str] = mapped_column(String, nullable=False, unique=True)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
         onupdate=func.now(),
     )
 
-    customer = relationship("Customer", back_populates="conversations")
+    customer: Mapped["Customer | None"] = relationship(back_populates="conversations")
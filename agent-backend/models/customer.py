@@ -1,19 +1,28 @@
 # backend/models/customer.py
-from sqlalchemy import Column, Integer, String, DateTime, func
-from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import String, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from db.database import Base
 
+if TYPE_CHECKING:
+    from models.conversation import Conversation
+    from models.document import Document
+
 
 class Customer(Base):
     __tablename__ = "customers"
 
-    id = Column(Integer, primary_key=True, index=True)
-    full_name = Column(String, nullable=False)
-    email = Column(String, unique=True, index=True)
-    title = Column(String, nullable=True)
-    location = Column(String, nullable=True)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    full_name: Mapped[str] = mapped_column(String, nullable=False)
+    email: Mapped[str | None] = mapped_column(String, unique=True, index=True)
+    title: Mapped[str | None] = mapped_column(String, nullable=True)
+    location: Mapped[str | None] = mapped_column(String, nullable=True)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
 
-    conversations = relationship("Conversation", back_populates="customer")
-    documents = relationship("Document", back_populates="customer")
+    conversations: Mapped[list["Conversation"]] = relationship(back_populates="customer")
+    documents: Mapped[list["Document"]] = relationship(back_populates="customer")
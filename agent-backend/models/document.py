@@ -1,18 +1,26 @@
 # backend/models/document.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
-from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import String, ForeignKey, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from db.database import Base
 
+if TYPE_CHECKING:
+    from models.customer import Customer
+
 
 class Document(Base):
     __tablename__ = "documents"
 
-    id = Column(Integer, primary_key=True, index=True)
-    customer_id = Column(Integer, ForeignKey("customers.id"), index=True)
-    title = Column(String, nullable=False)
-    url = Column(String, nullable=False)  # link to Google Drive or storage
-    type = Column(String, nullable=True)  # "resume", "360", etc.
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    customer_id: Mapped[int | None] = mapped_column(ForeignKey("customers.id"), index=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    url: Mapped[str] = mapped_column(String, nullable=False)  # link to Google Drive or storage
+    type: Mapped[str | None] = mapped_column(String, nullable=True)  # "resume", "360", etc.
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
 
-    customer = relationship("Customer", back_populates="documents")
+    customer: Mapped["Customer | None"] = relationship(back_populates="documents")
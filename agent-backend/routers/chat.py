@@ -1,83 +1,85 @@
 # backend/routers/chat.py
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import cast
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from config import settings
 from db.database import get_db
 from models.conversation import Conversation
 from schemas.chat import ChatMessageRequest, ChatMessageResponse
-from services.job_apply_client import job_apply_client
+from services.conversation_cache import get_thread_id, set_thread_id
+from services.job_apply_client import UPSTREAM_ERRORS, job_apply_client
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 
+async def _get_external_thread_id(db: AsyncSession, conversation_id: int) -> str:
+    # The thread id is immutable, so serve it from the cache and fall back to a
+    # single-column SELECT instead of hydrating the whole Conversation
+    external_thread_id = get_thread_id(conversation_id)
+    if external_thread_id is None:
+        external_thread_id = await db.scalar(
+            select(Conversation.external_thread_id).where(Conversation.id == conversation_id)
+        )
+        if not external_thread_id:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        set_thread_id(conversation_id, external_thread_id)
+    return external_thread_id
+
+
 @router.post("/conversations/{conversation_id}/messages", response_model=ChatMessageResponse)
 async def send_chat_message(
     conversation_id: int,
     payload: ChatMessageRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    conv = db.query(Conversation).filter(Conversation.id == conversation_id).first()
-    if not conv:
-        raise HTTPException(status_code=404, detail="Conversation not found")
+    external_thread_id = await _get_external_thread_id(db, conversation_id)
 
-    external_thread_id = cast(str, conv.external_thread_id)
-    
     # Send message to the live Donely agent
     try:
         external_resp = await job_apply_client.send_message(
             thread_id=external_thread_id,
             message=payload.message,
         )
-    except Exception as e:
+    except UPSTREAM_ERRORS as e:
         raise HTTPException(
             status_code=502,
-            detail=f"Failed to send message to agent: {str(e)}",
+            detail=f"Failed to send message to agent: {e}",
         )
 
-    # Parse the response from LangGraph API
-    # The response typically contains a state with messages
-    reply_text = _extract_reply_from_response(external_resp)
+    reply_text = job_apply_client.extract_reply(external_resp)
 
-    return ChatMessageResponse(reply=reply_text, raw=external_resp)
+    # response_model is for the docs; the raw agent state is returned as-is
+    return ORJSONResponse({"reply": reply_text, "raw": external_resp})
 
 
-def _extract_reply_from_response(resp: dict) -> str:
+@router.post("/conversations/{conversation_id}/messages/stream")
+async def stream_chat_message(
+    conversation_id: int,
+    payload: ChatMessageRequest,
+    db: AsyncSession = Depends(get_db),
+):
     """
-    Extract the assistant's reply from the LangGraph response.
-    The response structure from Donely includes:
-    - messages: array of message objects
-    - Each message has 'type' (human/ai) and 'content'
-    - We want the last 'ai' type message's content
+    Same as send_chat_message, but relays the agent's server-sent events as
+    they are generated so the client sees the first tokens without waiting for
+    the whole run to finish.
     """
+    external_thread_id = await _get_external_thread_id(db, conversation_id)
+
     try:
-        # Check if response has 'messages' array (LangGraph format)
-        messages = resp.get("messages", [])
-        if messages:
-            # Get the last message from the assistant (type='ai')
-            for msg in reversed(messages):
-                if isinstance(msg, dict) and msg.get("type") == "ai":
-                    content = msg.get("content", "")
-                    if content:
-                        return content
-            
-            # Fallback: just return the last message's content
-            last_msg = messages[-1]
-            if isinstance(last_msg, dict):
-                return last_msg.get("content", "")
-        
-        # Fallback: check for direct message/reply fields
-        if "reply" in resp:
-            return resp.get("reply", "")
-        if "message" in resp:
-            return resp.get("message", "")
-        if "content" in resp:
-            return resp.get("content", "")
-        
-        # If we can't parse, return the whole response as string
-        return str(resp)
-    except Exception as e:
-        print(f"Error parsing response: {e}")
-        return f"Agent response received but parsing failed: {str(e)}"
+        upstream = await job_apply_client.stream_message(
+            thread_id=external_thread_id,
+            message=payload.message,
+        )
+    except UPSTREAM_ERRORS as e:
+        raise HTTPException(
+            status_code=502,
+            detail=f"Failed to send message to agent: {e}",
+        )
+
+    return StreamingResponse(
+        upstream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
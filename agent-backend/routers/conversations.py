@@ -1,22 +1,33 @@
 # backend/routers/conversations.py
+import logging
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from config import settings
 from db.database import get_db
 from models.conversation import Conversation
 from schemas.conversation import ConversationCreate, ConversationRead
-from services.job_apply_client import job_apply_client
+from services.conversation_cache import forget_conversation
+from services.job_apply_client import (
+    UPSTREAM_ERRORS,
+    JobApplyResponseError,
+    job_apply_client,
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/conversations", tags=["conversations"])
 
+_CONVERSATION_LIST_ADAPTER = TypeAdapter(List[ConversationRead])
+
 
 @router.post("/", response_model=ConversationRead, status_code=status.HTTP_201_CREATED)
 async def create_conversation(
     payload: ConversationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     # Create a new thread on the live Donely agent
     try:
@@ -24,14 +35,14 @@ async def create_conversation(
         external_thread_id = external_resp.get("thread_id") or external_resp.get("id")
         
         if not external_thread_id:
-            raise ValueError(f"Agent did not return a thread ID. Response: {external_resp}")
+            raise JobApplyResponseError(f"Agent did not return a thread ID. Response: {external_resp}")
         
-        print(f"Created thread with ID: {external_thread_id}")
-    except Exception as e:
-        print(f"Error creating thread with live agent: {e}")
+        logger.debug("Created thread with ID: %s", external_thread_id)
+    except UPSTREAM_ERRORS as e:
+        logger.warning("Error creating thread with live agent: %s", e)
         raise HTTPException(
             status_code=502,
-            detail=f"Failed to create conversation thread: {str(e)}",
+            detail=f"Failed to create conversation thread: {e}",
         )
 
     # Store in local database
@@ -41,32 +52,40 @@ async def create_conversation(
         external_thread_id=external_thread_id,
     )
     db.add(conv)
-    db.commit()
-    db.refresh(conv)
+    await db.commit()
     return conv
 
 
 @router.get("/customer/{customer_id}", response_model=List[ConversationRead])
-def list_customer_conversations(customer_id: int, db: Session = Depends(get_db)):
-    conversations = (
-        db.query(Conversation)
-        .filter(Conversation.customer_id == customer_id)
+async def list_customer_conversations(customer_id: int, db: AsyncSession = Depends(get_db)):
+    conversations = await db.execute(
+        select(
+            Conversation.id,
+            Conversation.customer_id,
+            Conversation.title,
+            Conversation.external_thread_id,
+            Conversation.created_at,
+        )
+        .where(Conversation.customer_id == customer_id)
         .order_by(Conversation.created_at.desc())
-        .all()
     )
-    return conversations
+    rows = _CONVERSATION_LIST_ADAPTER.validate_python(conversations.all(), from_attributes=True)
+    # already validated by the adapter; response_model is for the docs
+    return Response(_CONVERSATION_LIST_ADAPTER.dump_json(rows), media_type="application/json")
 
 
 @router.delete("/{conversation_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_conversation(conversation_id: int, db: Session = Depends(get_db)):
-    conv = (
-        db.query(Conversation)
-        .filter(Conversation.id == conversation_id)
-        .first()
+async def delete_conversation(conversation_id: int, db: AsyncSession = Depends(get_db)):
+    # Single DELETE ... WHERE id = ? RETURNING id; the returned id doubles as
+    # the existence check, so the row is never loaded just to be removed
+    deleted_id = await db.scalar(
+        delete(Conversation)
+        .where(Conversation.id == conversation_id)
+        .returning(Conversation.id)
     )
 
-    if not conv:
+    if deleted_id is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    db.delete(conv)
-    db.commit()
\ No newline at end of file
+    await db.commit()
+    forget_conversation(conversation_id)
\ No newline at end of file
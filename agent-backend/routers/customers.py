@@ -1,6 +1,8 @@
 # backend/routers/customers.py
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from db.database import get_db
@@ -9,16 +11,44 @@ from schemas.customer import CustomerCreate, CustomerRead
 
 router = APIRouter(prefix="/customers", tags=["customers"])
 
+_CUSTOMER_LIST_ADAPTER = TypeAdapter(List[CustomerRead])
+
 
 @router.post("/", response_model=CustomerRead)
-def create_customer(payload: CustomerCreate, db: Session = Depends(get_db)):
+async def create_customer(payload: CustomerCreate, db: AsyncSession = Depends(get_db)):
     customer = Customer(**payload.model_dump())
     db.add(customer)
-    db.commit()
-    db.refresh(customer)
+    await db.commit()
     return customer
 
 
 @router.get("/", response_model=List[CustomerRead])
-def list_customers(db: Session = Depends(get_db)):
-    return db.query(Customer).all()
+async def list_customers(
+    cursor: int | None = None,
+    limit: int | None = Query(None, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    # Without `limit` the full list is returned; a full page sets X-Next-Cursor
+    stmt = select(
+        Customer.id,
+        Customer.full_name,
+        Customer.email,
+        Customer.title,
+        Customer.location,
+        Customer.created_at,
+    ).order_by(Customer.id)
+    if cursor is not None:
+        stmt = stmt.where(Customer.id > cursor)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    customers = await db.execute(stmt)
+    rows = _CUSTOMER_LIST_ADAPTER.validate_python(customers.all(), from_attributes=True)
+
+    headers = None
+    if limit is not None and len(rows) == limit:
+        headers = {"X-Next-Cursor": str(rows[-1].id)}
+    # rows are validated above; response_model only documents the schema
+    return Response(
+        _CUSTOMER_LIST_ADAPTER.dump_json(rows), media_type="application/json", headers=headers
+    )
@@ -1,11 +1,11 @@
 # backend/routers/documents.py
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.database import get_db
 from models.document import Document
 from schemas.document import DocumentCreate, DocumentRead
-from services.job_apply_client import job_apply_client
+from services.job_apply_client import UPSTREAM_ERRORS, job_apply_client
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
@@ -15,19 +15,18 @@ async def upload_document(
     customer_id: int,
     title: str,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    contents = await file.read()
-
     # optionally send to external job-apply agent
+    # pass the spooled file through so the upload is streamed, not buffered
     try:
         _ = await job_apply_client.upload_document(
             customer_id=customer_id,
-            file_bytes=contents,
+            file=file.file,
             filename=file.filename or "uploaded_file",
             content_type=file.content_type or "application/octet-stream",
         )
-    except Exception as e:
+    except UPSTREAM_ERRORS as e:
         raise HTTPException(
             status_code=502,
             detail=f"Failed to upload document to external agent: {e}",
@@ -41,6 +40,5 @@ async def upload_document(
         type="resume",
     )
     db.add(doc)
-    db.commit()
-    db.refresh(doc)
+    await db.commit()
     return doc
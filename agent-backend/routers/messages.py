@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
-from typing import Any, Dict, cast
+from typing import Any, Dict
 
 from db.database import get_db
 from models.conversation import Conversation
-from services.job_apply_client import job_apply_client
+from services.job_apply_client import UPSTREAM_ERRORS, job_apply_client
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -21,14 +22,14 @@ class ChatMessageResponse(BaseModel):
 async def send_chat_message(
     conversation_id: int,
     payload: ChatMessageRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     # find conversation + external thread id
-    conv = db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    conv = await db.scalar(select(Conversation).where(Conversation.id == conversation_id))
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    external_thread_id = cast(str, conv.external_thread_id)
+    external_thread_id = conv.external_thread_id
     if not external_thread_id:
         raise HTTPException(status_code=500, detail="Conversation missing external thread ID")
 
@@ -37,7 +38,7 @@ async def send_chat_message(
             thread_id=external_thread_id,
             message=payload.message,
         )
-    except Exception as e:
+    except UPSTREAM_ERRORS as e:
         raise HTTPException(
             status_code=502,
             detail=f"Failed to send message to external agent: {e}",
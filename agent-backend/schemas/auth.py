@@ -2,7 +2,7 @@
 
 from typing import Optional
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 class Token(BaseModel):
     access_token: str = Field(..., description="JWT access token")
@@ -20,5 +20,4 @@ class UserInDB(BaseModel):
     is_employer: bool
     created_at: Optional[datetime]
 
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,5 +1,5 @@
 # backend/schemas/conversation.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
 
@@ -17,5 +17,4 @@ class ConversationRead(ConversationBase):
     external_thread_id: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
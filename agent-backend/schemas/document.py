@@ -1,5 +1,5 @@
 # backend/schemas/document.py
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
 
@@ -18,5 +18,4 @@ class DocumentRead(DocumentBase):
     id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
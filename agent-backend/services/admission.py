@@ -0,0 +1,46 @@
+# backend/services/admission.py
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class AdmissionController:
+    """
+    Caps the number of concurrent outbound calls.
+    Callers wait on a Condition until a slot frees up; the limit can be changed
+    at runtime with set_limit() and waiting callers are woken if it grows.
+    """
+
+    def __init__(self, max_concurrent: int) -> None:
+        self._limit = max_concurrent
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    async def set_limit(self, max_concurrent: int) -> None:
+        async with self._cond:
+            grew = max_concurrent > self._limit
+            self._limit = max_concurrent
+            if grew:
+                self._cond.notify_all()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._limit)
+            self._active += 1
+        try:
+            yield
+        finally:
+            # decrement before taking the lock so a cancellation while waiting
+            # for it can't leak the slot
+            self._active -= 1
+            async with self._cond:
+                self._cond.notify(1)
@@ -0,0 +1,22 @@
+# backend/services/conversation_cache.py
+from typing import Optional
+
+from cachetools import TTLCache
+
+# conversation_id -> external_thread_id. The thread id never changes for a
+# conversation, so a short TTL only bounds staleness across workers after deletes.
+# Only touched from async handlers on the event loop and none of these helpers
+# await, so no lock is needed.
+_thread_ids = TTLCache[int, str](maxsize=10_000, ttl=300)
+
+
+def get_thread_id(conversation_id: int) -> Optional[str]:
+    return _thread_ids.get(conversation_id)
+
+
+def set_thread_id(conversation_id: int, thread_id: str) -> None:
+    _thread_ids[conversation_id] = thread_id
+
+
+def forget_conversation(conversation_id: int) -> None:
+    _thread_ids.pop(conversation_id, None)
@@ -1,80 +1,113 @@
 # backend/services/job_apply_client.py
-import sys
-from pathlib import Path
-import uuid
-
-# Ensure the agent-backend directory is in sys.path for absolute imports
-# This allows 'from config import settings' to work
-parent_dir = Path(__file__).parent.parent
-if str(parent_dir) not in sys.path:
-    sys.path.insert(0, str(parent_dir))
+import asyncio
+import json
+import logging
+import random
+from contextlib import AsyncExitStack, nullcontext
 
 import httpx
-from typing import Any, Dict, Optional
-from config import settings
-
-# Create a persistent HTTP client for connection pooling
-# This reuses connections instead of creating new ones for each request
-_client: Optional[httpx.AsyncClient] = None
-
-async def get_http_client() -> httpx.AsyncClient:
-    """Get or create a persistent HTTP client for connection pooling"""
-    global _client
-    if _client is None:
-        _client = httpx.AsyncClient(
-            timeout=30.0,
-            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
-        )
-    return _client
+from typing import IO, Any, AsyncIterator, Dict
+from config import get_settings
+from services.admission import AdmissionController
+
+logger = logging.getLogger(__name__)
+
+# None of the agent POSTs are idempotent, so only failures where the request was
+# rejected before any work started are retried: connection/pool errors (nothing
+# was sent) and 429/503 (explicitly refused). 502/504 and read timeouts are not:
+# a gateway may already have handed the request to the agent.
+_RETRY_STATUSES = frozenset({429, 503})
+_RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_MAX_ATTEMPTS = 3
+_RETRY_BACKOFF = 0.5  # seconds, doubled on each attempt
+_MAX_RETRY_AFTER = 10.0  # longer Retry-After waits fail fast instead
+
+
+class JobApplyConfigError(RuntimeError):
+    """The agent API base URL or assistant ID is not configured."""
+
+
+class JobApplyResponseError(Exception):
+    """The agent answered, but without the fields the caller needs."""
+
+
+# What a JobApplyClient call raises when the upstream call fails: transport and
+# HTTP status errors, missing configuration, undecodable JSON bodies and
+# responses missing required fields
+UPSTREAM_ERRORS = (
+    httpx.HTTPError,
+    JobApplyConfigError,
+    json.JSONDecodeError,
+    JobApplyResponseError,
+)
 
 
 class JobApplyClient:
     def __init__(self) -> None:
+        settings = get_settings()
         self.base_url = settings.JOB_APPLY_API_BASE
         self.api_key = settings.JOB_APPLY_API_KEY
         self.assistant_id = settings.JOB_APPLY_ASSISTANT_ID
+        # bounds concurrent runs; resize at runtime with `admission.set_limit(n)`
+        self.admission = AdmissionController(settings.JOB_APPLY_MAX_CONCURRENT_RUNS)
+        # One pooled client for the lifetime of the process, so each call reuses a
+        # warm connection instead of paying a fresh TCP+TLS handshake. HTTP/2 is
+        # negotiated via ALPN (falls back to HTTP/1.1) so concurrent calls to the
+        # agent multiplex over a single connection.
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else None
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url or "",
+            headers=headers,
+            http2=True,
+            # fail fast on connect and on waiting for a pooled connection, so one
+            # slow agent run can't starve the rest; reads get 60s for long runs
+            timeout=httpx.Timeout(connect=5.0, read=60.0, write=60.0, pool=5.0),
+            # agent runs are already capped by the admission controller; the pool
+            # is sized so uploads and thread creation never queue behind them.
+            # Idle sockets expire before typical upstream keep-alive timeouts so
+            # a reused connection isn't one the server has already dropped.
+            limits=httpx.Limits(
+                max_connections=1000, max_keepalive_connections=100, keepalive_expiry=30.0
+            ),
+        )
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client (called on application shutdown)"""
+        await self._client.aclose()
+
+    async def warm_up(self) -> None:
+        """
+        Open a pooled connection to the agent at startup so the first request
+        doesn't pay DNS + TCP + TLS setup. Any response keeps the connection
+        warm; failures are logged and otherwise ignored. Every phase of the
+        request is capped at 5s so a slow agent can't hold up startup.
+        """
+        if not self.base_url:
+            return
+        try:
+            # short timeout overrides the client's 60s read/write defaults
+            await self._client.get("/ok", timeout=httpx.Timeout(5.0))
+        except httpx.HTTPError as e:
+            logger.warning("Agent warm-up failed: %s", e)
 
     def _require_base_url(self) -> str:
         if not self.base_url:
-            raise RuntimeError(
+            raise JobApplyConfigError(
                 "JOB_APPLY_API_BASE is not configured. "
                 "Set it in your backend .env file before using the JobApplyClient."
             )
         return self.base_url
 
-    def _headers(self) -> Dict[str, str]:
-        headers = {"Content-Type": "application/json"}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
-
-    async def create_thread(self) -> Dict[str, Any]:
-        """
-        Create a new thread/conversation for the Donely agent.
-        Uses the LangGraph API endpoint with connection pooling.
-        """
-        client = await get_http_client()
-        resp = await client.post(
-            f"{self._require_base_url()}/threads",
-            json={},
-            headers=self._headers(),
-        )
-        resp.raise_for_status()
-        return resp.json()
-
-    async def send_message(self, thread_id: str, message: str) -> Dict[str, Any]:
-        """
-        Send a message to the Donely agent in an existing thread.
-        Uses the LangGraph streaming API with connection pooling for faster responses.
-        """
+    def _require_assistant_id(self) -> str:
         if not self.assistant_id:
-            raise RuntimeError(
+            raise JobApplyConfigError(
                 "JOB_APPLY_ASSISTANT_ID is not configured. "
                 "Set it in your backend .env file before using the JobApplyClient."
             )
-        
-        client = await get_http_client()
-        payload = {
+        return self.assistant_id
+
+    def _run_payload(self, message: str) -> Dict[str, Any]:
+        return {
             "input": {
                 "messages": [
                     {
@@ -83,44 +116,200 @@ class JobApplyClient:
                     }
                 ]
             },
-            "assistant_id": self.assistant_id
+            "assistant_id": self._require_assistant_id(),
         }
-        
-        url = f"{self._require_base_url()}/threads/{thread_id}/runs/wait"
-        resp = await client.post(url, json=payload, headers=self._headers())
-        resp.raise_for_status()
+
+    async def _post_with_retry(
+        self, url: str, *, admit: bool = False, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        POST to the agent, retrying transient failures with jittered exponential
+        backoff. With `admit`, each attempt holds an admission slot; the backoff
+        sleep does not.
+        """
+        attempt = 1
+        while True:
+            delay = _RETRY_BACKOFF * 2 ** (attempt - 1) + random.uniform(0, 0.1)
+            try:
+                async with self.admission.slot() if admit else nullcontext():
+                    resp = await self._client.post(url, **kwargs)
+            except _RETRY_EXCEPTIONS as e:
+                if attempt == _MAX_ATTEMPTS:
+                    raise
+                logger.warning("Agent call to %s failed (%s); retrying", url, e)
+            else:
+                if resp.status_code not in _RETRY_STATUSES or attempt == _MAX_ATTEMPTS:
+                    resp.raise_for_status()
+                    return resp
+                retry_after = _retry_after_seconds(resp)
+                if retry_after is not None:
+                    if retry_after > _MAX_RETRY_AFTER:
+                        resp.raise_for_status()
+                    delay = max(delay, retry_after)
+                logger.warning("Agent call to %s returned %s; retrying", url, resp.status_code)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def create_thread(self) -> Dict[str, Any]:
+        """
+        Create a new thread/conversation for the Donely agent.
+        Uses the LangGraph API endpoint with connection pooling.
+        """
+        self._require_base_url()
+        # retried only when the agent refused the request outright (connect
+        # errors, 429/503); retrying a gateway error could orphan a thread
+        resp = await self._post_with_retry("/threads", json={})
         return resp.json()
 
+    async def send_message(self, thread_id: str, message: str) -> Dict[str, Any]:
+        """
+        Send a message to the Donely agent in an existing thread.
+        Uses the LangGraph streaming API with connection pooling for faster responses.
+        """
+        self._require_base_url()
+        payload = self._run_payload(message)
+        resp = await self._post_with_retry(
+            f"/threads/{thread_id}/runs/wait", admit=True, json=payload
+        )
+        return resp.json()
+
+    async def stream_message(self, thread_id: str, message: str) -> AsyncIterator[bytes]:
+        """
+        Start a streamed run for a message in an existing thread.
+        Upstream errors raise here, before anything is relayed; on success the
+        returned iterator yields LangGraph's server-sent event stream of message
+        chunks. The admission slot and the upstream response are held until the
+        iterator is exhausted or closed, so streamed runs count against the cap
+        for their whole duration.
+        """
+        self._require_base_url()
+        payload = self._run_payload(message)
+        payload["stream_mode"] = "messages-tuple"
+        request = self._client.build_request(
+            "POST", f"/threads/{thread_id}/runs/stream", json=payload
+        )
+        stack = AsyncExitStack()
+        await stack.enter_async_context(self.admission.slot())
+        try:
+            resp = await self._client.send(request, stream=True)
+            stack.push_async_callback(resp.aclose)
+            if resp.is_error:
+                await resp.aread()
+                resp.raise_for_status()
+        except BaseException:
+            await stack.aclose()
+            raise
+        return _relay_stream(resp, stack)
+
     async def create_conversation(self, customer_id: int, title: str) -> Dict[str, Any]:
         """
         Create a new conversation session by creating a thread.
         """
         return await self.create_thread()
 
+    def extract_reply(self, resp: Any) -> str:
+        """
+        Extract the assistant's reply from a runs/wait response.
+        The agent returns the LangGraph thread state, whose last message is
+        the AI reply, so that is read directly; anything else (including
+        content-block lists) goes through the slower shape-probing fallback.
+        """
+        messages = resp.get("messages") if isinstance(resp, dict) else None
+        if isinstance(messages, list) and messages:
+            last_msg = messages[-1]
+            if isinstance(last_msg, dict) and last_msg.get("type") == "ai":
+                content = last_msg.get("content")
+                if isinstance(content, str) and content:
+                    return content
+        return _extract_reply_fallback(resp)
+
     async def upload_document(
         self,
         customer_id: int,
-        file_bytes: bytes,
+        file: IO[bytes] | bytes,
         filename: str,
         content_type: str = "application/pdf",
     ) -> Dict[str, Any]:
         """
         Upload a document to the Donely agent.
+        Accepts a file-like object (e.g. UploadFile.file), which httpx streams
+        into the multipart body in chunks instead of holding it all in memory.
         Uses connection pooling for better performance.
         """
-        client = await get_http_client()
+        self._require_base_url()
         files = {
-            "file": (filename, file_bytes, content_type),
+            "file": (filename, file, content_type),
         }
         data = {"customer_id": str(customer_id)}
-        resp = await client.post(
-            f"{self._require_base_url()}/documents/upload",
-            data=data,
-            files=files,
-            headers=self._headers(),
-        )
-        resp.raise_for_status()
+        # no explicit Content-Type: httpx sets the multipart boundary header, and
+        # rewinds the file when a retry re-renders the body
+        resp = await self._post_with_retry("/documents/upload", data=data, files=files)
         return resp.json()
 
 
+async def _relay_stream(resp: httpx.Response, stack: AsyncExitStack) -> AsyncIterator[bytes]:
+    # Exhaustion, cancellation and aclose() all unwind the stack (closing the
+    # response, then freeing the slot); an abandoned iterator is closed by
+    # asyncio's async-generator finalizer once it is dropped
+    async with stack:
+        async for chunk in resp.aiter_bytes():
+            yield chunk
+
+
+def _retry_after_seconds(resp: httpx.Response) -> float | None:
+    """The delay a 429/503 asks for via Retry-After, when given in seconds"""
+    value = resp.headers.get("Retry-After", "").strip()
+    return float(value) if value.isdigit() else None
+
+
+def _content_text(content: Any) -> str:
+    """Flatten message content (a string or a list of content blocks) to text"""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            block if isinstance(block, str) else str(block.get("text", ""))
+            for block in content
+            if isinstance(block, (str, dict))
+        )
+    return "" if content is None else str(content)
+
+
+def _extract_reply_fallback(resp: Any) -> str:
+    """
+    Generic reply extraction for responses that aren't a plain LangGraph state
+    ending in an AI text message.
+    """
+    try:
+        messages = resp.get("messages")
+        if messages:
+            # Get the last non-empty message from the assistant (type='ai')
+            content = next(
+                (
+                    msg["content"]
+                    for msg in reversed(messages)
+                    if isinstance(msg, dict) and msg.get("type") == "ai" and msg.get("content")
+                ),
+                None,
+            )
+            if content:
+                return _content_text(content)
+
+            # Fallback: just return the last message's content
+            last_msg = messages[-1]
+            if isinstance(last_msg, dict):
+                return _content_text(last_msg.get("content"))
+
+        # Fallback: check for direct message/reply fields
+        for key in ("reply", "message", "content"):
+            if key in resp:
+                return _content_text(resp.get(key))
+
+        # If we can't parse, return the whole response as string
+        return str(resp)
+    except Exception as e:
+        logger.warning("Error parsing agent response: %s", e)
+        return f"Agent response received but parsing failed: {e}"
+
+
 job_apply_client = JobApplyClient()